@@ -1,16 +1,20 @@
-import json
+import os
 import tempfile
 from pathlib import Path
 
-import boto3
 import geopandas as gpd
 import numpy as np
+import orjson
 import pandas as pd
-import requests
 import xarray as xr
+from boto3.s3.transfer import TransferConfig
 
+from app.clients import HTTP_TIMEOUT, get_http_session, get_s3_client
 from app.get_values_logger import logger
 
+HTTP_CHUNKSIZE = 1024 * 1024
+S3_TRANSFER_CHUNKSIZE = 8 * 1024 * 1024
+
 
 def extract_bucket_and_key_from_s3_url(s3_path):
     """
@@ -28,6 +32,55 @@ def extract_bucket_and_key_from_s3_url(s3_path):
     return bucket, key
 
 
+def get_geojson_crs(geojson: dict) -> str | None:
+    """
+    Returns the CRS named in a GeoJSON object's legacy 'crs' member.
+
+    Args:
+        geojson (dict): The GeoJSON object.
+
+    Returns:
+        str | None: The CRS name, or None if the object does not declare one.
+    """
+    crs = geojson.get("crs") or {}
+    return (crs.get("properties") or {}).get("name")
+
+
+def check_feature_geometries(features: list[dict]) -> None:
+    """
+    Checks that every GeoJSON feature has a geometry.
+
+    Args:
+        features (list[dict]): The GeoJSON features.
+
+    Raises:
+        ValueError: If a feature has a null or missing geometry.
+    """
+    for index, feature in enumerate(features):
+        if not (feature.get("geometry") or {}).get("type"):
+            raise ValueError(f"Feature {index} has no geometry")
+
+
+def get_s3_transfer_config() -> TransferConfig:
+    """
+    Builds the transfer configuration used for S3 downloads.
+
+    Files larger than the chunk size are fetched as parallel ranged GETs.
+    The number of threads can be lowered on slow links with the
+    S3_MAX_CONCURRENCY environment variable; a value of 1 disables threading.
+
+    Returns:
+        TransferConfig: The S3 transfer configuration.
+    """
+    max_concurrency = int(os.environ.get("S3_MAX_CONCURRENCY", 10))
+    return TransferConfig(
+        multipart_threshold=S3_TRANSFER_CHUNKSIZE,
+        multipart_chunksize=S3_TRANSFER_CHUNKSIZE,
+        max_concurrency=max_concurrency,
+        use_threads=max_concurrency > 1,
+    )
+
+
 class AssetData:
     def __init__(self, source: str):
         self.source = source
@@ -58,13 +111,13 @@ class AssetData:
         Raises:
             RuntimeError: If the file is empty or contains invalid JSON.
         """
-        with open(file_path, encoding="utf-8") as file:
+        with open(file_path, "rb") as file:
             content = file.read()
             if not content.strip():
                 raise RuntimeError(f"The JSON file {file_path} is empty.")
             try:
-                return json.loads(content)
-            except json.JSONDecodeError as exc:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError as exc:
                 raise RuntimeError(
                     f"Failed to decode the content of the JSON file {file_path}"
                 ) from exc
@@ -101,16 +154,19 @@ class AssetData:
         Returns:
             Path: The path to the downloaded file.
         """
-        logger.info(f"Downloading {self.source} using HTTP...")
-        response = requests.get(self.source)
-        response.raise_for_status()  # Raise an error for HTTP issues
+        logger.info("Downloading %s using HTTP...", self.source)
         file_extension = Path(self.source).suffix
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=file_extension, delete=False
-        ) as temp_file:
-            logger.info("Writing downloaded file to temporary location")
-            temp_file.write(response.text)
-            temp_file.close()
+        with get_http_session().get(
+            self.source, stream=True, timeout=HTTP_TIMEOUT
+        ) as response:
+            response.raise_for_status()  # Raise an error for HTTP issues
+            with tempfile.NamedTemporaryFile(
+                mode="wb", suffix=file_extension, delete=False
+            ) as temp_file:
+                logger.info("Writing downloaded file to temporary location")
+                # Stream the body to disk without holding it in memory.
+                for chunk in response.iter_content(chunk_size=HTTP_CHUNKSIZE):
+                    temp_file.write(chunk)
         return Path(temp_file.name)
 
     def _download_from_s3(self) -> Path:
@@ -120,11 +176,11 @@ class AssetData:
         Returns:
             Path: The path to the downloaded file.
         """
-        s3 = boto3.client("s3")
+        s3 = get_s3_client()
         bucket_name, key = extract_bucket_and_key_from_s3_url(self.source)
-        logger.info(f"Downloading key: {key} from bucket: {bucket_name}...")
+        logger.info("Downloading key: %s from bucket: %s...", key, bucket_name)
         local_file = Path(key).name
-        s3.download_file(bucket_name, key, local_file)
+        s3.download_file(bucket_name, key, local_file, Config=get_s3_transfer_config())
         return Path(local_file)
 
     def _process_file(self, file_path: Path) -> tuple:
@@ -138,9 +194,14 @@ class AssetData:
             tuple: A tuple containing the JSON data and GeoDataFrame.
         """
         if file_path.suffix in [".geojson", ".json"]:
-            logger.info(f"Processing GeoJSON/JSON file: {file_path}")
+            logger.info("Processing GeoJSON/JSON file: %s", file_path)
             data = self.load_json_from_file(file_path.as_posix())
-            gdf = gpd.read_file(file_path.as_posix())
+            check_feature_geometries(data["features"])
+            # Build the GeoDataFrame from the parsed JSON rather than having
+            # GDAL read and parse the same file a second time.
+            gdf = gpd.GeoDataFrame.from_features(
+                data["features"], crs=get_geojson_crs(data)
+            )
         elif file_path.suffix == ".csv":
             with open(file_path, encoding="utf-8") as f:
                 first_line = f.readline().strip()
@@ -149,15 +210,16 @@ class AssetData:
                         "Detected JSON-like content in CSV file. Parsing as JSON."
                     )
                     data = self.load_json_from_file(file_path.as_posix())
+                    check_feature_geometries(data["features"])
                     gdf = gpd.GeoDataFrame.from_features(data["features"])
                 else:
-                    logger.info(f"Processing CSV file: {file_path}")
+                    logger.info("Processing CSV file: %s", file_path)
                     gdf = self.csv_to_geodataframe(file_path.as_posix())
                     data = (
                         gdf.__geo_interface__
                     )  # Convert GeoDataFrame to GeoJSON-like dict
         else:
-            logger.error(f"Unsupported file type: {file_path.suffix}")
+            logger.error("Unsupported file type: %s", file_path.suffix)
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
         return data, gdf
 
@@ -172,7 +234,7 @@ class AssetData:
             gpd.GeoDataFrame: A GeoDataFrame with geometry created
             from latitude and longitude.
         """
-        logger.info(f"Converting CSV file {file_path} to GeoDataFrame")
+        logger.info("Converting CSV file %s to GeoDataFrame", file_path)
         try:
             df = pd.read_csv(file_path)
             if "latitude" not in df.columns or "longitude" not in df.columns:
@@ -186,13 +248,18 @@ class AssetData:
             )
             return gdf
         except Exception as e:
-            logger.error(f"Failed to convert CSV to GeoDataFrame: {e}")
+            logger.error("Failed to convert CSV to GeoDataFrame: %s", e)
             raise RuntimeError(f"Error processing CSV file {file_path}") from e
 
     def point_to_xr_dataset(self) -> xr.Dataset:
         """
         Converts points data to an xarray Dataset.
 
+        The x and y variables share a single "points" dimension, so they can
+        be passed straight to ``.sel(x=..., y=..., method="nearest")`` to
+        sample every point in one vectorised (pointwise) selection rather
+        than looping over points.
+
         Returns:
         xr.Dataset: Dataset with points as coordinates.
 
@@ -202,15 +269,24 @@ class AssetData:
         logger.info("Converting points to xarray Dataset")
         try:
             features = self.json_data["features"]
-            latitudes = np.array(
-                [feature["geometry"]["coordinates"][1] for feature in features]
-            )
-            longitudes = np.array(
-                [feature["geometry"]["coordinates"][0] for feature in features]
+            # Single pass over the features, keeping only the x/y pair.
+            coordinates = np.array(
+                [feature["geometry"]["coordinates"][:2] for feature in features],
+                dtype=np.float64,
             )
-        except (KeyError, TypeError, IndexError) as e:
-            logger.error(f"Invalid points data: {e}")
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            logger.error("Invalid points data: %s", e)
             raise ValueError("Invalid points data") from e
+        if not features:
+            coordinates = np.empty((0, 2))
+        if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+            logger.error("Invalid points data: every point needs x and y")
+            raise ValueError("Invalid points data")
+        if not np.isfinite(coordinates).all():
+            logger.error("Invalid points data: missing or non-finite coordinates")
+            raise ValueError("Invalid points data")
+        longitudes = coordinates[:, 0]
+        latitudes = coordinates[:, 1]
 
         dataset = xr.Dataset(
             {"x": (["points"], longitudes), "y": (["points"], latitudes)},
@@ -220,21 +296,18 @@ class AssetData:
     def polygon_to_gdf(self) -> gpd.GeoDataFrame:
         return gpd.GeoDataFrame.from_features(self.json_data["features"])
 
-    def get_geometry_types(self) -> list:
-        geom_type_list = self._list_geometry_types()
-        if not geom_type_list:
-            raise ValueError("No geometry types found")
-        first_type = geom_type_list[0]
-        for geom_type in geom_type_list:
-            if geom_type != first_type:
+    def get_geometry_types(self) -> str:
+        # Single pass that stops at the first geometry type that differs.
+        first_type = None
+        for index, feature in enumerate(self.json_data.get("features", [])):
+            geometry_type = (feature.get("geometry") or {}).get("type")
+            if not geometry_type:
+                # Value extraction needs a geometry for every feature.
+                raise ValueError(f"Feature {index} has no geometry")
+            if first_type is None:
+                first_type = geometry_type
+            elif geometry_type != first_type:
                 return "Mixed"
+        if first_type is None:
+            raise ValueError("No geometry types found")
         return first_type
-
-    def _list_geometry_types(self) -> list:
-        geometry_types = []
-        for feature in self.json_data.get("features", []):
-            geometry = feature.get("geometry", {})
-            geometry_type = geometry.get("type")
-            if geometry_type:
-                geometry_types.append(geometry_type)
-        return geometry_types
@@ -0,0 +1,46 @@
+"""
+Shared network clients, created lazily and reused for the life of the process.
+"""
+
+import functools
+
+import boto3
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connect and read timeouts, in seconds, for requests made with the session.
+HTTP_TIMEOUT = (3, 30)
+
+
+@functools.cache
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide requests session.
+
+    Reusing a single session keeps connections to the same host alive
+    between requests instead of paying a new TCP/TLS handshake each time.
+    The connection pool is sized so that every worker fetching STAC items
+    concurrently can keep its own connection to the catalog host.
+
+    Returns:
+        requests.Session: The shared HTTP session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@functools.cache
+def get_s3_client():
+    """
+    Returns the process-wide boto3 S3 client.
+
+    Creating a client resolves the credential chain and builds the botocore
+    service model, so it is done once and the client is shared.
+
+    Returns:
+        botocore.client.S3: The shared S3 client.
+    """
+    return boto3.client("s3")
@@ -1,8 +1,8 @@
 import rioxarray as rxr
 import xarray as xr
 
+from app.data_models import DatasetDetails
 from app.get_values_logger import logger
-from app.stac_parsing import DatasetDetails
 
 
 class DatasetDataArray:
@@ -76,5 +76,5 @@ class DatasetDataArray:
                     ds.rio.write_crs("EPSG:4326", inplace=True)
             return ds
         except Exception as e:
-            logger.error(f"Failed to open dataset from URL: {url}. Error: {e}")
+            logger.error("Failed to open dataset from URL: %s. Error: %s", url, e)
             raise e
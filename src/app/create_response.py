@@ -1,14 +1,28 @@
+import csv
 import datetime as dt
-import json
 import mimetypes
 import os
 import time
 from pathlib import Path
 
-import geopandas as gpd
+import orjson
 
 from app.get_values_logger import logger
 
+# Static parts of the output STAC documents, built once at import time.
+_GLOBAL_BBOX = (-180, -90, 180, 90)
+_GLOBAL_GEOMETRY = {
+    "type": "Polygon",
+    "coordinates": (((-180, -90), (-180, 90), (180, 90), (180, -90), (-180, -90)),),
+}
+_STAC_CATALOG_TEMPLATE = {
+    "stac_version": "1.0.0",
+    "id": "",
+    "type": "Catalog",
+    "title": "LST Results",
+    "description": "Root catalog",
+}
+
 
 class ResponseStatus:
     SUCCESS = "success"
@@ -54,18 +68,13 @@ class WorkflowResponse:
             "stac_version": "1.0.0",
             "id": f"{stem}-{now}",
             "type": "Feature",
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [
-                    [[-180, -90], [-180, 90], [180, 90], [180, -90], [-180, -90]]
-                ],
-            },
+            "geometry": _GLOBAL_GEOMETRY,
             "properties": {
                 "created": f"{dateNow}",
                 "datetime": f"{dateNow}",
                 "updated": f"{dateNow}",
             },
-            "bbox": [-180, -90, 180, 90],
+            "bbox": _GLOBAL_BBOX,
             "assets": {
                 f"{stem}": {
                     "type": f"{mime}",
@@ -94,17 +103,13 @@ class WorkflowResponse:
         """
         stem = Path(self.out_file).stem
         catalog = {
-            "stac_version": "1.0.0",
-            "id": "",
-            "type": "Catalog",
-            "title": "LST Results",
-            "description": "Root catalog",
+            **_STAC_CATALOG_TEMPLATE,
             "links": [
                 {"type": "application/geo+json", "rel": "item", "href": f"{stem}.json"},
                 {"type": "application/json", "rel": "self", "href": "catalog.json"},
             ],
+            "data": self.process_response,
         }
-        catalog["data"] = self.process_response
         return catalog
 
     def write_stac_files(self):
@@ -115,7 +120,7 @@ class WorkflowResponse:
             json_to_file(self.stac_item, f"{Path(self.out_file).stem}.json")
             json_to_file(self.stac_catalog_root, "./catalog.json")
         except Exception as e:
-            logger.error(f"Error writing STAC files: {e}")
+            logger.error("Error writing STAC files: %s", e)
 
     def to_csv(self) -> None:
         """
@@ -126,18 +131,25 @@ class WorkflowResponse:
         process_response (dict): The input JSON data.
         out_csv (str): The output CSV file path.
         """
-        data = self.process_response.get("features", [])
-        gdf = gpd.GeoDataFrame.from_features(data)
+        features = self.process_response.get("features", [])
+
+        # Collect the header first so rows can be streamed straight to disk.
+        # Property columns come first, followed by the returned value columns,
+        # each in order of first appearance.
+        property_names = {}
+        value_names = {}
+        for feature in features:
+            properties = feature.get("properties") or {}
+            property_names.update(dict.fromkeys(properties))
+            value_names.update(dict.fromkeys(properties.get("returned_values", {})))
+        property_names.pop("returned_values", None)
+        fieldnames = [*property_names, *value_names]
 
-        def extract_datetime_values(row):
-            for key, val in row["returned_values"].items():
-                row[key] = val["value"] if val.get("value") else "none"
-            return row
-
-        gdf = gdf.apply(extract_datetime_values, axis=1)
-        gdf.drop(columns=["returned_values", "geometry"], inplace=True)
         csv_filename = "./data.csv"
-        gdf.to_csv(csv_filename, index=False)
+        with open(csv_filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(_feature_to_csv_row(feature) for feature in features)
 
     def create_error_response(self) -> dict:
         """
@@ -156,6 +168,16 @@ class WorkflowResponse:
         json_to_file(error_return, self.out_file)
 
 
+def _feature_to_csv_row(feature: dict) -> dict:
+    """
+    Flattens a feature's properties and returned values into a single CSV row.
+    """
+    row = dict(feature.get("properties") or {})
+    for key, val in row.pop("returned_values", {}).items():
+        row[key] = val["value"] if val.get("value") else "none"
+    return row
+
+
 def json_to_file(json_data: dict, file_path: str) -> None:
     """
     Writes JSON data to a file.
@@ -164,8 +186,10 @@ def json_to_file(json_data: dict, file_path: str) -> None:
         json_data (dict): The JSON data to write.
         file_path (str): The path to the file where the JSON data will be written.
     """
-    with open(file_path, "w", encoding="utf-8") as f:
-        try:
-            json.dump(json_data, f)
-        except Exception as e:
-            logger.error(f"Error writing data to file, {file_path}: {e}")
+    try:
+        payload = orjson.dumps(json_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    except Exception as e:
+        logger.error("Error writing data to file, %s: %s", file_path, e)
+        return
+    with open(file_path, "wb") as f:
+        f.write(payload)
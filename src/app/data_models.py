@@ -1,22 +1,28 @@
 import os
 from datetime import datetime
+from functools import cached_property
 
-from dateutil.parser import parse
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, computed_field
 
 from app.get_values_logger import logger
 
 
 class DatasetDetails(BaseModel):
+    # Immutable so the fields behind the cached output_name cannot change
+    # after it has been derived, and so instances are hashable.
+    model_config = ConfigDict(frozen=True)
+
     url: str
+    # Parsed from the STAC ISO 8601 string once, when the model is validated.
     datetime: datetime
     source_file_name: str
     unit: str | None
-    output_name: str = None
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        self.output_name = self.create_output_name()
+    @computed_field
+    @cached_property
+    def output_name(self) -> str:
+        # Derived from the other fields on first access and then reused.
+        return self.create_output_name()
 
     def to_dict(self):
         return {
@@ -42,8 +48,6 @@ class DatasetDetails(BaseModel):
         output_name_template = os.environ.get("OUTPUT_NAME_TEMPLATE", None)
         dt = self.datetime
         file_name = self.source_file_name
-        if type(dt) is str:
-            dt = parse(dt)
         datetime_string = dt.strftime("%Y-%m-%d %H:%M:%S")
         logger.debug(
             "Datetime string: %s, File name: %s",
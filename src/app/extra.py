@@ -1,7 +1,8 @@
 import ast
-import json
 import os
 
+import orjson
+
 from app.get_values_logger import logger
 
 
@@ -16,12 +17,12 @@ def string_to_json(string: str) -> dict | None:
         dict | None: The JSON object if conversion is successful, None otherwise.
     """
     try:
-        return json.loads(string)
-    except json.JSONDecodeError:
+        return orjson.loads(string)
+    except orjson.JSONDecodeError:
         try:
             return ast.literal_eval(string)
         except (ValueError, SyntaxError) as ast_err:
-            logger.error(f"ast.literal_eval failed: {ast_err}")
+            logger.error("ast.literal_eval failed: %s", ast_err)
             return None
 
 
@@ -1,5 +1,6 @@
 import ast
 import operator
+from collections.abc import Iterable, Iterator
 
 import numpy as np
 import rasterio as rio
@@ -11,8 +12,8 @@ from shapely.geometry import mapping
 
 from app.asset_data import AssetData
 from app.create_dataarray import DatasetDataArray
+from app.data_models import DatasetDetails
 from app.get_values_logger import logger
-from app.stac_parsing import DatasetDetails
 
 aws_session = AWSSession(aws_unsigned=True)
 
@@ -20,11 +21,15 @@ aws_session = AWSSession(aws_unsigned=True)
 class DatasetsValueExtractor:
     def __init__(
         self,
-        dataset_details_list: list[DatasetDetails],
+        dataset_details_list: Iterable[DatasetDetails],
         assets: AssetData,
         expression: str,
     ):
-        self.dataset_details_list = dataset_details_list
+        # May be a one-shot iterator, so datasets can be processed while the
+        # remaining STAC items are still being fetched. Datasets are kept as
+        # they are consumed so that later passes can reuse them.
+        self._dataset_details = []
+        self._pending_dataset_details = iter(dataset_details_list)
         self.assets = assets
         self.geometry_type_to_function = {
             "Point": ValueExtractor.get_values_points,
@@ -33,12 +38,25 @@ class DatasetsValueExtractor:
         }
         self.expression = expression
 
+    def iter_dataset_details(self) -> Iterator[DatasetDetails]:
+        """
+        Iterates over the datasets, starting with those already consumed and
+        then drawing the rest from the input iterable.
+
+        Returns:
+            Iterator[DatasetDetails]: The details of every dataset.
+        """
+        yield from self._dataset_details
+        for dataset_details in self._pending_dataset_details:
+            self._dataset_details.append(dataset_details)
+            yield dataset_details
+
     def get_values_for_multiple_variables(self, variables: list[str]) -> dict:
         for variable in variables:
             self.get_values_for_datasets(variable, output_name_suffix=f"_{variable}")
 
     def get_min_max_values(self) -> dict:
-        for dataset_details in self.dataset_details_list:
+        for dataset_details in self.iter_dataset_details():
             self.get_min_max_values_for_dataset(dataset_details=dataset_details)
 
     def get_min_max_values_for_dataset(self, dataset_details: DatasetDetails) -> None:
@@ -78,7 +96,7 @@ class DatasetsValueExtractor:
     def get_values_for_datasets(
         self, variable: str, output_name_suffix: str = ""
     ) -> dict:
-        for dataset_details in self.dataset_details_list:
+        for dataset_details in self.iter_dataset_details():
             self.get_values_for_dataset(
                 dataset_details=dataset_details,
                 variable=variable,
@@ -109,34 +127,34 @@ class DatasetsValueExtractor:
     ) -> None:
         if self.assets.geometry_type != "Point":
             output_name_suffix = f"{output_name_suffix}_average"
+        output_name = dataset_details.output_name + output_name_suffix
+        # These fields are the same for every asset, so build them once.
+        dataset_fields = {
+            "datetime": dataset_details.datetime.isoformat(),
+            "unit": dataset_details.unit,
+            "file_name": dataset_details.source_file_name,
+            "key": output_name,
+        }
         for index, result in enumerate(results):
             self._update_asset_properties(
                 index=index,
-                dataset_details=dataset_details,
+                output_name=output_name,
                 result=result,
-                output_name_suffix=output_name_suffix,
+                dataset_fields=dataset_fields,
             )
 
     def _update_asset_properties(
         self,
         index: int,
-        dataset_details: DatasetDetails,
+        output_name: str,
         result: any,
-        output_name_suffix: str = "",
+        dataset_fields: dict,
     ) -> None:
-        output_name = dataset_details.output_name + output_name_suffix
         properties = self.assets.json_data["features"][index]["properties"]
         returned_values = properties.setdefault("returned_values", {})
         dataset_values = returned_values.setdefault(output_name, {})
-        dataset_values.update(
-            {
-                "value": result,
-                "datetime": dataset_details.datetime.isoformat(),
-                "unit": dataset_details.unit,
-                "file_name": dataset_details.source_file_name,
-                "key": output_name,
-            }
-        )
+        dataset_values["value"] = result
+        dataset_values.update(dataset_fields)
 
     def add_summary_statistics(self):
         for feature in self.assets.json_data["features"]:
@@ -195,7 +213,7 @@ class ValueExtractor:
         try:
             with rio.Env(aws_session):
                 index_keys = list(self.dataset._indexes.keys())
-                logger.info(f"Index keys: {index_keys}")
+                logger.info("Index keys: %s", index_keys)
                 if "lat" in index_keys and "lon" in index_keys:
                     logger.info("Using lat and lon as indexes")
                     values = self.dataset.sel(
@@ -212,10 +230,10 @@ class ValueExtractor:
                     ).values.tolist()
                 else:
                     logger.error("Unsupported index keys")
-                    values = [None] * len(self.assets.x)
+                    values = [None] * self.assets.no_of_assets
         except Exception as e:
-            logger.error(f"Error extracting values from points: {e}")
-            values = [None] * len(self.assets.data.x)
+            logger.error("Error extracting values from points: %s", e)
+            values = [None] * self.assets.no_of_assets
         values = [None if str(v) == "nan" else v for v in values]
         return values
 
@@ -241,7 +259,7 @@ class ValueExtractor:
                 logger.error("NoDataInBounds")
                 results.append(None)
             except Exception as e:
-                logger.error(f"Error extracting values from polygon: {e}")
+                logger.error("Error extracting values from polygon: %s", e)
                 results.append(None)
         return [None if str(v) == "nan" else v for v in results]
 
@@ -274,7 +292,7 @@ class ValueExtractor:
             ).ds
             return dataset
         except Exception as e:
-            logger.error(f"Error loading dataset: {e}")
+            logger.error("Error loading dataset: %s", e)
             dataset = None
         return dataset
 
@@ -1,13 +1,24 @@
+import functools
 import logging
 
 import pystac_client
 
 from app.extra import parse_string_to_list
+from app.stac_parsing import get_self_href
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _open_client(catalog_url: str) -> pystac_client.Client:
+    """
+    Opens a STAC catalog client, reusing it for repeated searches of the
+    same catalog so its landing page and HTTP session are only set up once.
+    """
+    return pystac_client.Client.open(catalog_url)
+
+
 class StacSearch:
     def __init__(
         self,
@@ -26,8 +37,8 @@ class StacSearch:
         self.collections = parse_string_to_list(collection)
         self.max_items = max_items
         self.search = self.search_catalog()
-        self.results = self.get_search_results()
-        self.number_of_results = len(self.results)
+        self.items = self.get_search_results()
+        self.number_of_results = len(self.items)
 
     def open_catalog(self) -> pystac_client.Client:
         """
@@ -39,8 +50,8 @@ class StacSearch:
         Returns:
             pystac_client.Client: The opened STAC catalog client.
         """
-        logger.info(f"Opening catalog at {self.catalog_url}")
-        catalog = pystac_client.Client.open(self.catalog_url)
+        logger.info("Opening catalog at %s", self.catalog_url)
+        catalog = _open_client(self.catalog_url)
         return catalog
 
     def search_catalog(self) -> pystac_client.ItemSearch:
@@ -59,8 +70,9 @@ class StacSearch:
         """
         time_range = f"{self.start_date}/{self.end_date}"
         logger.info(
-            "Searching catalog for items with time"
-            f"range {time_range} and query {self.query}"
+            "Searching catalog for items with time range %s and query %s",
+            time_range,
+            self.query,
         )
         if self.query is None:
             search_params = {"datetime": time_range}
@@ -69,29 +81,32 @@ class StacSearch:
             search_params = {"datetime": time_range, "filter": cq2_filter}
         if self.collections:
             search_params["collections"] = self.collections
-            logger.info(f"Searching collection {self.collections}")
+            logger.info("Searching collection %s", self.collections)
         if self.max_items:
             search_params["max_items"] = self.max_items
-        logger.info(f"Searching catalog with parameters: {search_params}")
+        logger.info("Searching catalog with parameters: %s", search_params)
         search = self.catalog.search(**search_params)
         return search
 
-    def get_search_results(self) -> list:
+    def get_search_results(self) -> list[dict]:
         """
-        Retrieves asset hrefs from search results.
+        Retrieves the STAC items from search results.
+
+        The items are read as plain dictionaries, which avoids building a
+        pystac Item for every result. They hold the full item documents, so
+        they can be parsed without fetching each item again.
 
         Args:
             search (pystac_client.ItemSearch): The search results.
 
         Returns:
-            list: A list of asset href values.
+            list[dict]: The STAC items found by the search.
         """
         logger.info("Getting search results")
-        results = []
-        for item in self.search.items():
-            results.append(item.get_self_href())
-            logger.info(item.get_self_href())
-        return results
+        items = list(self.search.items_as_dicts())
+        for item in items:
+            logger.info("%s", get_self_href(item))
+        return items
 
     def query_to_filter(self) -> dict:
         """
@@ -104,12 +119,8 @@ class StacSearch:
         Returns:
             dict: A CQL2 JSON filter combining all conditions with an 'and' operator.
         """
-        filters = []
-        for key, value in self.query.items():
-            filters.append(
-                {
-                    "op": "=",
-                    "args": [{"property": f"properties.{key}"}, value],
-                }
-            )
+        filters = [
+            {"op": "=", "args": [{"property": f"properties.{key}"}, value]}
+            for key, value in self.query.items()
+        ]
         return {"op": "and", "args": filters}
@@ -3,19 +3,42 @@ Provides functions for parsing STAC (SpatioTemporal Asset Catalog) items,
 retrieving specific assets such as COG (Cloud Optimized GeoTIFF) URLs.
 """
 
-import json
+import functools
+import hashlib
+import os
+import re
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from http import HTTPStatus
 from pathlib import Path
 
+import orjson
 import requests
 
+from app.clients import HTTP_TIMEOUT, get_http_session
 from app.data_models import DatasetDetails
 from app.get_values_logger import logger
 
+# Upper bound on the number of STAC items fetched concurrently.
+MAX_FETCH_WORKERS = 16
+
+# Matches hrefs of the assets that can be opened as datasets (GeoTIFF or
+# JSON files), capturing the file name without its extension.
+DATA_FILE_PATTERN = re.compile(r"([^/]+)\.(?:tiff?|json)/*$")
+
+# Default lifetime, in seconds, of entries in the optional STAC item cache.
+DEFAULT_STAC_CACHE_TTL = 86400
+
 
 class StacItem:
-    def __init__(self, url: str):
+    def __init__(self, url: str, stac_item: dict | None = None):
         self.url = url
-        self.stac_item = self.get_stac_item()
+        # A caller that already holds the item JSON can pass it in to skip
+        # the network fetch.
+        self.stac_item = stac_item if stac_item is not None else self.get_stac_item()
         self.asset_details = self.get_asset_details()
 
     def get_stac_item(self) -> dict:
@@ -31,21 +54,35 @@ class StacItem:
         Returns:
         - dict: The STAC item loaded as a dictionary.
         """
+        cached_item = _read_cached_stac_item(self.url)
+        if cached_item is not None:
+            return cached_item
         try:
-            logger.debug(f"Attempting to open URL: {self.url}")
-            response = requests.get(self.url)
+            logger.debug("Attempting to open URL: %s", self.url)
+            response = get_http_session().get(
+                self.url,
+                headers=_cache_validation_headers(self.url),
+                timeout=HTTP_TIMEOUT,
+            )
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                # The stale cached copy is still current, so renew it.
+                cached_item = _read_cached_stac_item(self.url, renew=True)
+                if cached_item is not None:
+                    return cached_item
+                response = get_http_session().get(self.url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            stac_item = response.json()
+            stac_item = orjson.loads(response.content)
+            _write_cached_stac_item(self.url, response)
             return stac_item
-        except (requests.RequestException, json.JSONDecodeError) as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             if isinstance(e, requests.RequestException):
-                logger.error(f"Error opening {self.url}: {type(e).__name__}: {e}")
+                logger.error("Error opening %s: %s: %s", self.url, type(e).__name__, e)
                 raise ValueError(
                     f"Error opening {self.url}: {type(e).__name__}: {e}"
                 ) from e
-            elif isinstance(e, json.JSONDecodeError):
+            elif isinstance(e, orjson.JSONDecodeError):
                 logger.error(
-                    f"Error loading JSON from {self.url}: {type(e).__name__}: {e}"
+                    "Error loading JSON from %s: %s: %s", self.url, type(e).__name__, e
                 )
                 raise ValueError(
                     f"Error loading JSON from {self.url}: {type(e).__name__}: {e}"
@@ -53,49 +90,260 @@ class StacItem:
 
     def get_asset_details(self) -> DatasetDetails:
         """
-        Extract the URL of the first asset
-        found in the STAC item's assets.
-
-        Iterates through the assets in the provided STAC item, looking
-        for an asset with a media type of 'image/tiff' and returns the
-        URL of the first match along with the datetime property of the STAC item.
-
-        Parameters:
+        Extract the details of the first data asset in the STAC item.
 
         Returns:
-        - dict: A dictionary containing the properties of the assets, if found.
-        None otherwise.
+        - DatasetDetails: The details of the asset if found, None otherwise.
         """
-        file_types = [".tif", ".tiff", ".json"]
-        logger.debug("Getting asset details")
-        for _, asset_value in self.stac_item.get("assets", {}).items():
-            url = asset_value.get("href")
-            asset_suffix = Path(url).suffix
-            if asset_suffix in file_types:
-                dt = self.stac_item.get("properties", {}).get("datetime")
-                source_file_name = Path(url).stem.replace(".", "-")
-                unit = self.stac_item.get("properties", {}).get("unit")
-                return DatasetDetails(
-                    url=url, datetime=dt, source_file_name=source_file_name, unit=unit
-                )
+        return get_asset_details(self.stac_item)
+
+
+def _stac_cache_path(url: str) -> Path | None:
+    """
+    Returns the cache file for a STAC item URL, or None if caching is disabled.
+
+    The cache is only used when the STAC_CACHE_DIR environment variable is
+    set, so that repeated runs (e.g. in CI) can share downloaded items.
+    """
+    cache_dir = os.environ.get("STAC_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return Path(cache_dir) / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+
+def _read_cached_stac_item(url: str, renew: bool = False) -> dict | None:
+    """
+    Returns the cached STAC item for a URL if a fresh copy exists.
+
+    With renew=True the entry is returned regardless of its age and its
+    lifetime is restarted, for use after the server confirms it is current.
+    """
+    cache_path = _stac_cache_path(url)
+    if cache_path is None:
+        return None
+    ttl = _parse_stac_cache_ttl(os.environ.get("STAC_CACHE_TTL"))
+    try:
+        if renew:
+            os.utime(cache_path)
+        elif time.time() - cache_path.stat().st_mtime > ttl:
+            return None
+        stac_item = orjson.loads(cache_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    logger.debug("Using cached STAC item for %s", url)
+    return stac_item
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_stac_cache_ttl(value: str | None) -> int:
+    """
+    Parses the STAC_CACHE_TTL environment variable, in seconds.
+
+    An invalid value is reported once and replaced by the default, so a
+    configuration mistake cannot stop STAC items from being fetched.
+    """
+    if value is None:
+        return DEFAULT_STAC_CACHE_TTL
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(
+            "Invalid STAC_CACHE_TTL %r, using %s seconds",
+            value,
+            DEFAULT_STAC_CACHE_TTL,
+        )
+        return DEFAULT_STAC_CACHE_TTL
+
+
+def _cache_validation_headers(url: str) -> dict:
+    """
+    Returns conditional request headers for a cached STAC item, if any.
+
+    Sending the stored ETag and Last-Modified values lets the server answer
+    with a body-less 304 when the cached item is still current.
+    """
+    cache_path = _stac_cache_path(url)
+    if cache_path is None:
+        return {}
+    try:
+        validators = orjson.loads(cache_path.with_suffix(".headers.json").read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _write_cached_stac_item(url: str, response: requests.Response) -> None:
+    """
+    Stores the raw STAC item JSON for a URL in the cache, if enabled, along
+    with the validators needed to revalidate it later.
+    """
+    cache_path = _stac_cache_path(url)
+    if cache_path is None:
+        return
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file_atomically(
+            cache_path.with_suffix(".headers.json"), orjson.dumps(validators)
+        )
+        _write_file_atomically(cache_path, response.content)
+    except OSError as e:
+        logger.warning("Could not cache STAC item %s: %s", url, e)
+
+
+def _write_file_atomically(path: Path, content: bytes) -> None:
+    """
+    Writes content to a path via a temporary file in the same directory,
+    so concurrent readers never see a partially written file.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".tmp", delete=False
+    ) as temp_file:
+        try:
+            temp_file.write(content)
+            temp_file.close()
+            os.replace(temp_file.name, path)
+        except BaseException:
+            temp_file.close()
+            Path(temp_file.name).unlink(missing_ok=True)
+            raise
 
 
-def get_asset_data_list(stac_item_url_list: list[str]) -> list[DatasetDetails]:
+def get_asset_details(stac_item: dict) -> DatasetDetails | None:
+    """
+    Extract the URL of the first asset
+    found in the STAC item's assets.
+
+    Iterates through the assets in the provided STAC item, looking
+    for an asset with a GeoTIFF or JSON file extension and returns the
+    URL of the first match along with the datetime property of the STAC item.
+
+    Parameters:
+    - stac_item (dict): The STAC item as a dictionary.
+
+    Returns:
+    - DatasetDetails: The details of the asset if found, None otherwise.
+    """
+    logger.debug("Getting asset details")
+    for asset_value in stac_item.get("assets", {}).values():
+        url = asset_value.get("href", "")
+        match = DATA_FILE_PATTERN.search(url)
+        if match:
+            properties = stac_item.get("properties", {})
+            return DatasetDetails(
+                url=url,
+                datetime=properties.get("datetime"),
+                source_file_name=match[1].replace(".", "-"),
+                unit=properties.get("unit"),
+            )
+    return None
+
+
+def get_asset_data_list(
+    stac_item_url_list: list[str], max_workers: int = MAX_FETCH_WORKERS
+) -> list[DatasetDetails]:
     """
     Retrieve a list of asset details from a list of STAC item URLs.
 
     This function retrieves a list of assetsdetails
     from a list of STAC (SpatioTemporal Asset Catalog) item
-    URLs.
+    URLs. Each distinct URL is fetched once, concurrently on a thread
+    pool, and the returned list keeps the order of the input URLs.
 
     Parameters:
     - stac_item_url_list (list[dict]): A list of URLs of STAC items.
+    - max_workers (int): The maximum number of items fetched concurrently.
 
     Returns:
     - list[AssetDetails]: A list of asset details found in the STAC items.
     """
-    asset_details_list = []
-    for stac_item_url in stac_item_url_list:
-        asset_details = StacItem(stac_item_url).asset_details
-        asset_details_list.append(asset_details)
-    return asset_details_list
+    return list(iter_asset_data(stac_item_url_list, max_workers=max_workers))
+
+
+def iter_asset_data(
+    stac_item_url_list: list[str], max_workers: int = MAX_FETCH_WORKERS
+) -> Iterator[DatasetDetails]:
+    """
+    Yield asset details for a list of STAC item URLs as they become available.
+
+    All distinct URLs are submitted to a thread pool up front, and each
+    result is yielded, in input order, as soon as its fetch completes. A
+    consumer can therefore start working on the first item while the
+    remaining items are still being downloaded.
+
+    Parameters:
+    - stac_item_url_list (list[dict]): A list of URLs of STAC items.
+    - max_workers (int): The maximum number of items fetched concurrently.
+
+    Returns:
+    - Iterator[DatasetDetails]: The asset details found in the STAC items.
+    """
+    # Submit in input order so the item the consumer waits on first is
+    # fetched first.
+    unique_urls = list(dict.fromkeys(stac_item_url_list))
+    if not unique_urls:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+        futures = {url: executor.submit(_get_asset_details, url) for url in unique_urls}
+        for url in stac_item_url_list:
+            yield futures[url].result()
+
+
+def iter_asset_data_from_items(
+    stac_items: list[dict], max_workers: int = MAX_FETCH_WORKERS
+) -> Iterator[DatasetDetails]:
+    """
+    Yield asset details for STAC items returned by a search.
+
+    STAC API searches return the full item documents, so their asset
+    details are read directly rather than fetched again. Items returned
+    without assets are fetched from their self link through
+    iter_asset_data instead.
+
+    Parameters:
+    - stac_items (list[dict]): The STAC items as dictionaries.
+    - max_workers (int): The maximum number of items fetched concurrently.
+
+    Returns:
+    - Iterator[DatasetDetails]: The asset details found in the STAC items.
+
+    Raises:
+    - ValueError: If an item has neither assets nor a self link.
+    """
+    fallback_urls = []
+    for stac_item in stac_items:
+        if "assets" not in stac_item:
+            url = get_self_href(stac_item)
+            if url is None:
+                raise ValueError(
+                    f"STAC item {stac_item.get('id')} has no assets or self link"
+                )
+            fallback_urls.append(url)
+    with closing(iter_asset_data(fallback_urls, max_workers=max_workers)) as fetched:
+        for stac_item in stac_items:
+            if "assets" in stac_item:
+                yield get_asset_details(stac_item)
+            else:
+                yield next(fetched)
+
+
+def get_self_href(stac_item: dict) -> str | None:
+    """
+    Returns the href of the 'self' link of a STAC item dictionary.
+    """
+    for link in stac_item.get("links", []):
+        if link.get("rel") == "self":
+            return link.get("href")
+    return None
+
+
+def _get_asset_details(stac_item_url: str) -> DatasetDetails:
+    return StacItem(stac_item_url).asset_details
@@ -4,6 +4,7 @@ Main starting point for the workflow.
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 from shortuuid import ShortUUID
 
@@ -13,18 +14,16 @@ from app.extra import process_extra_args, string_to_json
 from app.get_values import DatasetsValueExtractor
 from app.get_values_logger import logger
 from app.search_stac import StacSearch
-from app.stac_parsing import get_asset_data_list
+from app.stac_parsing import iter_asset_data_from_items
 
 
-def parse_arguments():
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parses command-line arguments for the request.
+    Builds the command-line argument parser for the request.
 
     Returns:
-        argparse.Namespace: An object that holds the parsed arguments as
-        attributes.
+        argparse.ArgumentParser: The argument parser.
     """
-    logger.info("Parsing command-line arguments")
     parser = argparse.ArgumentParser(description="Make a request.")
     parser.add_argument("--assets", type=str, help="GeoJSON string with points data")
     parser.add_argument(
@@ -40,7 +39,23 @@ def parse_arguments():
     parser.add_argument(
         "--extra_args", type=str, help="Extra arguments for the workflow", default=None
     )
-    args = parser.parse_args()
+    return parser
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parses command-line arguments for the request.
+
+    Args:
+        argv (list[str] | None): The arguments to parse. Defaults to
+        sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: An object that holds the parsed arguments as
+        attributes.
+    """
+    logger.info("Parsing command-line arguments")
+    args = build_parser().parse_args(argv)
 
     logger.info("Extra arguments: %s", args.extra_args)
 
@@ -62,30 +77,33 @@ def run_workflow(args: argparse.Namespace) -> None:
     Args:
         args (argparse.Namespace): The parsed command-line arguments.
     """
-    stac_search = StacSearch(
-        catalog_url=args.stac_catalog,
-        start_date=args.start_date,
-        end_date=args.end_date,
-        stac_query=args.stac_query,
-        collection=args.stac_collection,
-        max_items=args.max_items,
-    )
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The assets do not depend on the STAC search, so download them while
+        # the catalog is being searched.
+        assets_future = executor.submit(AssetData, args.assets)
+        stac_search = StacSearch(
+            catalog_url=args.stac_catalog,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            stac_query=args.stac_query,
+            collection=args.stac_collection,
+            max_items=args.max_items,
+        )
 
     no_of_results = stac_search.number_of_results
     if no_of_results == 0:
         logger.error("No STAC items found")
         WorkflowResponse(status=ResponseStatus.ERROR, error_msg="No STAC items found")
     else:
-        logger.info(f"Found {no_of_results} STAC items, getting points data")
-        spatial_data = AssetData(args.assets)
-
-        logger.info("Getting asset data list")
-        asset_data_list = get_asset_data_list(stac_search.results)
+        logger.info("Found %s STAC items, getting points data", no_of_results)
+        spatial_data = assets_future.result()
 
         logger.info("Getting values from STAC items")
 
+        # The search already returned the full STAC items, so they are parsed
+        # directly; any returned without assets are fetched in the background.
         dve = DatasetsValueExtractor(
-            dataset_details_list=asset_data_list,
+            dataset_details_list=iter_asset_data_from_items(stac_search.items),
             assets=spatial_data,
             expression=args.expression,
         )
@@ -0,0 +1,144 @@
+import orjson
+import pytest
+
+from app.asset_data import AssetData
+
+
+def _asset_data_from_features(features: list) -> AssetData:
+    # Bypass __init__ so the point conversion can be tested on its own.
+    asset_data = AssetData.__new__(AssetData)
+    asset_data.json_data = {"type": "FeatureCollection", "features": features}
+    return asset_data
+
+
+def _point(coordinates: list) -> dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": coordinates},
+        "properties": {},
+    }
+
+
+def test_point_to_xr_dataset():
+    """
+    Test point_to_xr_dataset keeps one point per feature.
+    """
+    asset_data = _asset_data_from_features(
+        [_point([-0.077, 51.482]), _point([1.0, 2.0, 3.0])]
+    )
+
+    dataset = asset_data.point_to_xr_dataset()
+
+    assert dataset.x.values.tolist() == [-0.077, 1.0]
+    assert dataset.y.values.tolist() == [51.482, 2.0]
+
+
+@pytest.mark.parametrize(
+    "coordinates",
+    [[[1.0], [2.0]], [[1.0, 2.0], [3.0]], [[1.0, 2.0], [3.0, float("nan")]]],
+    ids=["short", "ragged", "non_finite"],
+)
+def test_point_to_xr_dataset_invalid_coordinates(coordinates):
+    """
+    Test point_to_xr_dataset rejects points without a finite x and y.
+    """
+    asset_data = _asset_data_from_features([_point(c) for c in coordinates])
+
+    with pytest.raises(ValueError, match="Invalid points data"):
+        asset_data.point_to_xr_dataset()
+
+
+@pytest.mark.parametrize(
+    ("features", "expected"),
+    [
+        ([_point([1.0, 2.0]), _point([3.0, 4.0])], "Point"),
+        (
+            [
+                _point([1.0, 2.0]),
+                {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[1.0, 2.0], [3.0, 4.0]],
+                    },
+                    "properties": {},
+                },
+            ],
+            "Mixed",
+        ),
+    ],
+    ids=["point", "mixed"],
+)
+def test_get_geometry_types(features, expected):
+    """
+    Test get_geometry_types with a single and with mixed geometry types.
+    """
+    assert _asset_data_from_features(features).get_geometry_types() == expected
+
+
+@pytest.mark.parametrize(
+    "feature",
+    [
+        {"type": "Feature", "geometry": None, "properties": {}},
+        {"type": "Feature", "properties": {}},
+    ],
+    ids=["null_geometry", "missing_geometry"],
+)
+def test_get_geometry_types_feature_without_geometry(feature):
+    """
+    Test get_geometry_types rejects features without a geometry.
+    """
+    asset_data = _asset_data_from_features([_point([1.0, 2.0]), feature])
+
+    with pytest.raises(ValueError, match="Feature 1 has no geometry"):
+        asset_data.get_geometry_types()
+
+
+def _write_geojson(tmp_path, feature_collection: dict) -> str:
+    path = tmp_path / "assets.geojson"
+    path.write_bytes(orjson.dumps(feature_collection))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    ("crs", "expected"),
+    [
+        (None, "EPSG:4326"),
+        ({"type": "name", "properties": None}, "EPSG:4326"),
+        ({"type": "name", "properties": {"name": "EPSG:27700"}}, "EPSG:27700"),
+    ],
+    ids=["null_crs", "null_crs_properties", "named_crs"],
+)
+def test_asset_data_geojson_crs(tmp_path, crs, expected):
+    """
+    Test AssetData reads a GeoJSON file with a null or named legacy CRS.
+    """
+    source = _write_geojson(
+        tmp_path,
+        {
+            "type": "FeatureCollection",
+            "crs": crs,
+            "features": [_point([-0.077, 51.482]), _point([1.0, 2.0])],
+        },
+    )
+
+    asset_data = AssetData(source)
+
+    assert asset_data.crs == expected
+    assert asset_data.no_of_assets == 2
+
+
+def test_asset_data_feature_without_geometry(tmp_path):
+    """
+    Test AssetData rejects a GeoJSON file with a feature missing its geometry.
+    """
+    source = _write_geojson(
+        tmp_path,
+        {
+            "type": "FeatureCollection",
+            "features": [_point([1.0, 2.0]), {"type": "Feature", "properties": {}}],
+        },
+    )
+
+    with pytest.raises(ValueError, match="Feature 1 has no geometry"):
+        AssetData(source)
@@ -0,0 +1,76 @@
+from app.create_response import ResponseStatus, WorkflowResponse
+
+
+def _feature(properties: dict) -> dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [-0.077, 51.482]},
+        "properties": properties,
+    }
+
+
+def _write_csv(features: list, tmp_path) -> list[str]:
+    WorkflowResponse(
+        status=ResponseStatus.SUCCESS,
+        return_values={"type": "FeatureCollection", "features": features},
+    )
+    return (tmp_path / "data.csv").read_text(encoding="utf-8").splitlines()
+
+
+def test_to_csv(tmp_path, monkeypatch):
+    """
+    Test to_csv writes a row per feature with the properties followed by
+    a column per returned value, using "none" for empty values.
+    """
+    monkeypatch.chdir(tmp_path)
+    features = [
+        _feature(
+            {
+                "id": "a",
+                "returned_values": {
+                    "2024-07-02": {"value": 12.5},
+                    "2024-07-01": {"value": 0},
+                },
+                "max": 12.5,
+            }
+        ),
+        _feature(
+            {
+                "id": "b",
+                "returned_values": {
+                    "2024-07-02": {"value": None},
+                    "2024-07-01": {"value": 3.25},
+                },
+                "max": 3.25,
+            }
+        ),
+    ]
+
+    assert _write_csv(features, tmp_path) == [
+        "id,max,2024-07-02,2024-07-01",
+        "a,12.5,12.5,none",
+        "b,3.25,none,3.25",
+    ]
+
+
+def test_to_csv_missing_returned_value(tmp_path, monkeypatch):
+    """
+    Test to_csv leaves a blank cell for a value a feature does not have.
+    """
+    monkeypatch.chdir(tmp_path)
+    features = [
+        _feature({"id": "a", "returned_values": {"2024-07-01": {"value": 1}}}),
+        _feature(
+            {
+                "id": "b",
+                "returned_values": {"2024-07-02": {"value": 2}},
+                "name": "second",
+            }
+        ),
+    ]
+
+    assert _write_csv(features, tmp_path) == [
+        "id,name,2024-07-01,2024-07-02",
+        "a,,1,",
+        "b,second,,2",
+    ]
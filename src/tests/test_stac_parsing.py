@@ -1,70 +1,344 @@
-from app.stac_parsing import get_asset_details
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
 
+import orjson
+import pytest
 
-def test_get_asset_details():
+from app import stac_parsing
+from app.clients import HTTP_TIMEOUT
+from app.data_models import DatasetDetails
+from app.stac_parsing import (
+    StacItem,
+    get_asset_data_list,
+    get_asset_details,
+    iter_asset_data,
+    iter_asset_data_from_items,
+)
+
+_STAC_ITEM_OK = {
+    "assets": {
+        "asset1": {"type": "image/tiff", "href": "https://example.com/asset1.tif"},
+        "asset2": {
+            "type": "application/zstd",
+            "href": "https://example.com/asset2.zstd",
+        },
+    },
+    "properties": {"datetime": "2024-02-01T00:00:00Z", "unit": "c"},
+}
+
+_STAC_ITEM_NOMATCH = {
+    "assets": {
+        "asset1": {
+            "type": "application/json",
+            "href": "https://example.com/asset1.txt",
+        }
+    },
+    "properties": {"datetime": "2024-02-01T00:00:00Z", "unit": "c"},
+}
+
+_STAC_ITEM_NOUNIT = {
+    "assets": {
+        "asset1": {"type": "image/tiff", "href": "https://example.com/asset1.tif"}
+    },
+    "properties": {"datetime": "2024-02-01T00:00:00Z"},
+}
+
+_EXPECTED_OK = DatasetDetails(
+    url="https://example.com/asset1.tif",
+    datetime="2024-02-01T00:00:00Z",
+    source_file_name="asset1",
+    unit="c",
+)
+
+_EXPECTED_NOUNIT = DatasetDetails(
+    url="https://example.com/asset1.tif",
+    datetime="2024-02-01T00:00:00Z",
+    source_file_name="asset1",
+    unit=None,
+)
+
+
+@pytest.mark.parametrize(
+    ("stac_item", "expected"),
+    [
+        (_STAC_ITEM_OK, _EXPECTED_OK),
+        (_STAC_ITEM_NOMATCH, None),
+        (_STAC_ITEM_NOUNIT, _EXPECTED_NOUNIT),
+    ],
+    ids=["ok", "no_match", "missing_unit"],
+)
+def test_get_asset_details(stac_item, expected):
     """
-    Test get_asset_details function with a valid STAC item.
+    Test get_asset_details function with a valid STAC item, one with no
+    matching asset type and one with a missing unit property.
     """
-    stac_item = {
-        "assets": {
-            "asset1": {"type": "image/tiff", "href": "https://example.com/asset1.tif"},
-            "asset2": {
-                "type": "application/zstd",
-                "href": "https://example.com/asset2.zstd",
-            },
-        },
-        "properties": {"datetime": "2024-02-01T00:00:00Z", "unit": "c"},
-    }
+    assert get_asset_details(stac_item) == expected
 
-    expected_result = {
-        "url": "https://example.com/asset1.tif",
-        "datetime": "2024-02-01T00:00:00Z",
-        "source_file_name": "asset1",
-        "unit": "c",
-    }
 
-    result = get_asset_details(stac_item)
+_STAC_ITEM_URL = "https://example.com/items/item1"
+
 
-    print(f"result: {result}")
-    print(f"expected_result: {expected_result}")
-    assert result == expected_result
+def _response(status_code: int, content: bytes = b"", headers: dict | None = None):
+    return MagicMock(status_code=status_code, content=content, headers=headers or {})
 
 
-def test_get_asset_details_no_matching_asset():
+@pytest.fixture
+def stac_cache(tmp_path, monkeypatch):
     """
-    Test get_asset_details function with no matching asset type.
+    Enables the STAC item cache in a temporary directory with a 60s TTL.
     """
-    stac_item = {
-        "assets": {
-            "asset1": {
-                "type": "application/json",
-                "href": "https://example.com/asset1.txt",
-            }
-        },
-        "properties": {"datetime": "2024-02-01T00:00:00Z", "unit": "c"},
-    }
+    monkeypatch.setenv("STAC_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("STAC_CACHE_TTL", "60")
+    return tmp_path
+
 
-    result = get_asset_details(stac_item)
-    assert result is None
+@pytest.fixture
+def http_session(monkeypatch):
+    """
+    Replaces the shared HTTP session with a mock.
+    """
+    session = MagicMock()
+    monkeypatch.setattr(stac_parsing, "get_http_session", lambda: session)
+    return session
 
 
-def test_get_asset_details_missing_unit():
+def _seed_cache(stac_item: dict, age: float = 0) -> None:
+    response = _response(200, orjson.dumps(stac_item), {"ETag": '"v1"'})
+    stac_parsing._write_cached_stac_item(_STAC_ITEM_URL, response)
+    mtime = time.time() - age
+    os.utime(stac_parsing._stac_cache_path(_STAC_ITEM_URL), (mtime, mtime))
+
+
+def test_get_stac_item_fresh_cache_hit(stac_cache, http_session):
     """
-    Test get_asset_details function with a missing unit property.
+    Test a fresh cached STAC item is returned without a request.
     """
-    stac_item = {
-        "assets": {
-            "asset1": {"type": "image/tiff", "href": "https://example.com/asset1.tif"}
-        },
-        "properties": {"datetime": "2024-02-01T00:00:00Z"},
-    }
+    _seed_cache(_STAC_ITEM_OK)
+
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_OK
+    http_session.get.assert_not_called()
+
+
+def test_get_stac_item_expired_entry_not_modified(stac_cache, http_session):
+    """
+    Test an expired cached STAC item is revalidated and renewed on a 304.
+    """
+    _seed_cache(_STAC_ITEM_OK, age=120)
+    http_session.get.return_value = _response(304)
 
-    expected_result = {
-        "url": "https://example.com/asset1.tif",
-        "datetime": "2024-02-01T00:00:00Z",
-        "source_file_name": "asset1",
-        "unit": None,
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_OK
+    http_session.get.assert_called_once_with(
+        _STAC_ITEM_URL, headers={"If-None-Match": '"v1"'}, timeout=HTTP_TIMEOUT
+    )
+    cache_path = stac_parsing._stac_cache_path(_STAC_ITEM_URL)
+    assert time.time() - cache_path.stat().st_mtime < 60
+
+
+def test_get_stac_item_not_modified_without_cached_body(stac_cache, http_session):
+    """
+    Test the STAC item is fetched again when a 304 arrives for a cache
+    entry whose body has gone missing.
+    """
+    _seed_cache(_STAC_ITEM_OK, age=120)
+    stac_parsing._stac_cache_path(_STAC_ITEM_URL).unlink()
+    http_session.get.side_effect = [
+        _response(304),
+        _response(200, orjson.dumps(_STAC_ITEM_NOUNIT)),
+    ]
+
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_NOUNIT
+    assert http_session.get.call_args_list[1] == call(
+        _STAC_ITEM_URL, timeout=HTTP_TIMEOUT
+    )
+
+
+def test_get_stac_item_expired_entry_modified(stac_cache, http_session):
+    """
+    Test an expired cached STAC item is replaced when the server returns
+    a new version.
+    """
+    _seed_cache(_STAC_ITEM_OK, age=120)
+    http_session.get.return_value = _response(
+        200, orjson.dumps(_STAC_ITEM_NOUNIT), {"ETag": '"v2"'}
+    )
+
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_NOUNIT
+    cache_path = stac_parsing._stac_cache_path(_STAC_ITEM_URL)
+    assert orjson.loads(cache_path.read_bytes()) == _STAC_ITEM_NOUNIT
+    assert stac_parsing._cache_validation_headers(_STAC_ITEM_URL) == {
+        "If-None-Match": '"v2"'
     }
 
-    result = get_asset_details(stac_item)
-    assert result == expected_result
+
+def test_get_stac_item_corrupt_cache_entry(stac_cache, http_session):
+    """
+    Test a corrupt cached STAC item is ignored and overwritten.
+    """
+    cache_path = stac_parsing._stac_cache_path(_STAC_ITEM_URL)
+    cache_path.write_bytes(b"{not json")
+    http_session.get.return_value = _response(200, orjson.dumps(_STAC_ITEM_OK))
+
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_OK
+    http_session.get.assert_called_once()
+    assert orjson.loads(cache_path.read_bytes()) == _STAC_ITEM_OK
+
+
+@pytest.fixture
+def fake_stac_item(monkeypatch):
+    """
+    Replaces StacItem with a mock whose asset details name its URL.
+    """
+
+    def stac_item(url):
+        if url.endswith("broken"):
+            raise ValueError(f"Error opening {url}")
+        return SimpleNamespace(asset_details=f"details:{url}")
+
+    fake = MagicMock(side_effect=stac_item)
+    monkeypatch.setattr(stac_parsing, "StacItem", fake)
+    return fake
+
+
+def test_get_asset_data_list_keeps_order_and_fetches_once(fake_stac_item):
+    """
+    Test get_asset_data_list keeps the input order, including repeated
+    URLs, while fetching each distinct URL once.
+    """
+    urls = ["https://b/1", "https://a/2", "https://b/1", "https://c/3"]
+
+    assert get_asset_data_list(urls) == [f"details:{url}" for url in urls]
+    assert sorted(c.args[0] for c in fake_stac_item.call_args_list) == sorted(set(urls))
+
+
+@pytest.mark.parametrize(
+    ("no_of_urls", "max_workers", "expected"),
+    [(5, 2, 2), (2, 16, 2)],
+    ids=["capped_by_max_workers", "capped_by_urls"],
+)
+def test_get_asset_data_list_pool_size(
+    monkeypatch, fake_stac_item, no_of_urls, max_workers, expected
+):
+    """
+    Test the fetch pool is no larger than max_workers or the number of URLs.
+    """
+    pool_sizes = []
+
+    def executor(max_workers):
+        pool_sizes.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    monkeypatch.setattr(stac_parsing, "ThreadPoolExecutor", executor)
+    urls = [f"https://example.com/{i}" for i in range(no_of_urls)]
+
+    get_asset_data_list(urls, max_workers=max_workers)
+
+    assert pool_sizes == [expected]
+
+
+def test_get_asset_data_list_empty(fake_stac_item):
+    """
+    Test get_asset_data_list with no URLs.
+    """
+    assert get_asset_data_list([]) == []
+    fake_stac_item.assert_not_called()
+
+
+def test_get_asset_data_list_fetch_error(fake_stac_item):
+    """
+    Test an error fetching one STAC item is raised to the caller.
+    """
+    with pytest.raises(ValueError, match="Error opening https://example.com/broken"):
+        get_asset_data_list(["https://example.com/1", "https://example.com/broken"])
+
+
+def test_iter_asset_data_streams_results(monkeypatch):
+    """
+    Test iter_asset_data yields the first item before later fetches finish.
+    """
+    release = threading.Event()
+    slow_fetch_done = threading.Event()
+
+    def stac_item(url):
+        if url.endswith("slow"):
+            release.wait(timeout=5)
+            slow_fetch_done.set()
+        return SimpleNamespace(asset_details=f"details:{url}")
+
+    monkeypatch.setattr(stac_parsing, "StacItem", stac_item)
+    results = iter_asset_data(["https://example.com/1", "https://example.com/slow"])
+
+    assert next(results) == "details:https://example.com/1"
+    assert not slow_fetch_done.is_set()
+    release.set()
+    assert list(results) == ["details:https://example.com/slow"]
+
+
+def test_get_stac_item_invalid_cache_ttl(stac_cache, http_session, monkeypatch):
+    """
+    Test an invalid STAC_CACHE_TTL falls back to the default lifetime.
+    """
+    monkeypatch.setenv("STAC_CACHE_TTL", "one day")
+    _seed_cache(_STAC_ITEM_OK, age=120)
+
+    assert StacItem(_STAC_ITEM_URL).stac_item == _STAC_ITEM_OK
+    http_session.get.assert_not_called()
+
+
+def test_write_file_atomically_failure(tmp_path, monkeypatch):
+    """
+    Test a failed cache write leaves no temporary file behind.
+    """
+
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(stac_parsing.os, "replace", replace)
+
+    with pytest.raises(OSError, match="disk full"):
+        stac_parsing._write_file_atomically(tmp_path / "item.json", b"{}")
+    assert list(tmp_path.iterdir()) == []
+
+
+def _stac_item_without_assets(url: str) -> dict:
+    return {"id": url, "links": [{"rel": "self", "href": url}]}
+
+
+def test_iter_asset_data_from_items(fake_stac_item):
+    """
+    Test iter_asset_data_from_items parses items with assets directly and
+    fetches those without assets from their self link, keeping the order.
+    """
+    stac_items = [
+        _STAC_ITEM_OK,
+        _stac_item_without_assets("https://example.com/1"),
+        _STAC_ITEM_NOUNIT,
+        _stac_item_without_assets("https://example.com/2"),
+    ]
+
+    assert list(iter_asset_data_from_items(stac_items)) == [
+        _EXPECTED_OK,
+        "details:https://example.com/1",
+        _EXPECTED_NOUNIT,
+        "details:https://example.com/2",
+    ]
+    assert fake_stac_item.call_count == 2
+
+
+def test_iter_asset_data_from_items_no_fetch(fake_stac_item):
+    """
+    Test items that already hold their assets are not fetched again.
+    """
+    assert list(iter_asset_data_from_items([_STAC_ITEM_OK])) == [_EXPECTED_OK]
+    fake_stac_item.assert_not_called()
+
+
+def test_iter_asset_data_from_items_no_self_link(fake_stac_item):
+    """
+    Test an item with neither assets nor a self link is rejected.
+    """
+    with pytest.raises(ValueError, match="has no assets or self link"):
+        list(iter_asset_data_from_items([{"id": "item1", "links": []}]))